@@ -0,0 +1,48 @@
+import numpy as np
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List
+from models.data_models import Tweet
+from scraper.utils import extract_hashtags, extract_mentions
+
+@dataclass
+class TweetBatch:
+    """Column-oriented (struct-of-arrays) view of a list of tweets.
+
+    Numeric fields are NumPy arrays so analytics can run as vectorized
+    reductions; text and tag lists are kept as object arrays. The tag
+    columns are built on first access, since tweets that arrive without
+    hashtags/mentions need them extracted from their text and most
+    analyses never read them.
+    """
+    likes: np.ndarray
+    retweets: np.ndarray
+    replies: np.ndarray
+    views: np.ndarray
+    is_reply: np.ndarray
+    text: np.ndarray
+    tweets: List[Tweet] = field(repr=False)
+
+    @classmethod
+    def from_tweets(cls, tweets: List[Tweet]) -> "TweetBatch":
+        n = len(tweets)
+        return cls(
+            likes=np.fromiter((t.likes for t in tweets), dtype=np.int64, count=n),
+            retweets=np.fromiter((t.retweets for t in tweets), dtype=np.int64, count=n),
+            replies=np.fromiter((t.replies for t in tweets), dtype=np.int64, count=n),
+            views=np.fromiter((t.views or 0 for t in tweets), dtype=np.int64, count=n),
+            is_reply=np.fromiter((t.is_reply for t in tweets), dtype=np.bool_, count=n),
+            text=np.fromiter((t.text for t in tweets), dtype=object, count=n),
+            tweets=tweets
+        )
+
+    @cached_property
+    def hashtags(self) -> np.ndarray:
+        return np.fromiter((t.hashtags or extract_hashtags(t.text) for t in self.tweets), dtype=object, count=len(self.tweets))
+
+    @cached_property
+    def mentions(self) -> np.ndarray:
+        return np.fromiter((t.mentions or extract_mentions(t.text) for t in self.tweets), dtype=object, count=len(self.tweets))
+
+    def __len__(self) -> int:
+        return len(self.likes)
@@ -1,15 +1,51 @@
-import pandas as pd
-from textblob import TextBlob
-from typing import List, Dict, Any
+import csv
+import numpy as np
+from typing import List, Dict, Any, Union
 from collections import Counter
+from itertools import chain
 from models.data_models import Tweet, Profile
+from scraper.utils import extract_hashtags, extract_mentions
+from .batch import TweetBatch
+
+# Analyzer methods take either raw tweets or a prebuilt batch, so callers
+# running several analyses can convert once and reuse it
+Tweets = Union[List[Tweet], TweetBatch]
+
+CSV_FIELDS = list(Tweet.model_fields.keys())
+CSV_LIST_FIELDS = ('hashtags', 'mentions', 'media_urls')
+
+def _as_batch(tweets: Tweets) -> TweetBatch:
+    return tweets if isinstance(tweets, TweetBatch) else TweetBatch.from_tweets(tweets)
 
 class TwitterAnalyzer:
     def __init__(self):
-        pass
+        # The VADER lexicon is loaded on first use and reused for every tweet
+        self._sia = None
+
+    @staticmethod
+    def extract_hashtags(text: str) -> List[str]:
+        """Extracts hashtags from tweet text with the shared precompiled pattern."""
+        return extract_hashtags(text)
+
+    @staticmethod
+    def extract_mentions(text: str) -> List[str]:
+        """Extracts mentions from tweet text with the shared precompiled pattern."""
+        return extract_mentions(text)
+
+    def _polarity(self, text: str) -> float:
+        # Media-only tweets come through with empty text; skip the lexicon pass
+        if not text or text.isspace():
+            return 0.0
+        return self._sia.polarity_scores(text)["compound"]
+
+    def _load_sentiment_analyzer(self):
+        # Deferred so importing the app doesn't pay for VADER until /analyze is hit
+        if self._sia is None:
+            from .sentiment import BakedSentimentIntensityAnalyzer
+            self._sia = BakedSentimentIntensityAnalyzer()
 
-    def analyze_sentiment(self, tweets: List[Tweet]) -> Dict[str, Any]:
-        """Analyzes sentiment of tweets using TextBlob."""
+    def analyze_sentiment(self, tweets: Tweets) -> Dict[str, Any]:
+        """Analyzes sentiment of tweets using VADER compound scores."""
         if not tweets:
             return {
                 "positive_count": 0,
@@ -21,37 +57,31 @@ class TwitterAnalyzer:
                 "average_polarity": 0
             }
 
-        sentiments = []
-        positive = 0
-        negative = 0
-        neutral = 0
-        
-        for tweet in tweets:
-            blob = TextBlob(tweet.text)
-            polarity = blob.sentiment.polarity
-            sentiments.append(polarity)
-            
-            if polarity > 0.1:
-                positive += 1
-            elif polarity < -0.1:
-                negative += 1
-            else:
-                neutral += 1
+        self._load_sentiment_analyzer()
+        batch = _as_batch(tweets)
+        polarities = np.fromiter(
+            (self._polarity(text) for text in batch.text),
+            dtype=np.float64,
+            count=len(batch)
+        )
 
-        total = len(tweets)
-        avg_polarity = sum(sentiments) / total if total > 0 else 0
+        total = len(polarities)
+        positive = int((polarities > 0.1).sum())
+        negative = int((polarities < -0.1).sum())
+        neutral = total - positive - negative
+        avg_polarity = float(polarities.mean())
 
         return {
             "positive_count": positive,
             "neutral_count": neutral,
             "negative_count": negative,
-            "positive_pct": round((positive / total) * 100, 2) if total > 0 else 0,
-            "neutral_pct": round((neutral / total) * 100, 2) if total > 0 else 0,
-            "negative_pct": round((negative / total) * 100, 2) if total > 0 else 0,
+            "positive_pct": round((positive / total) * 100, 2),
+            "neutral_pct": round((neutral / total) * 100, 2),
+            "negative_pct": round((negative / total) * 100, 2),
             "average_polarity": round(avg_polarity, 4)
         }
 
-    def calculate_engagement(self, profile: Profile, tweets: List[Tweet]) -> Dict[str, float]:
+    def calculate_engagement(self, profile: Profile, tweets: Tweets) -> Dict[str, float]:
         """Calculates engagement metrics with correct formulas."""
         if not tweets:
             return {
@@ -64,13 +94,17 @@ class TwitterAnalyzer:
                 "total_impressions": 0
             }
 
-        total_likes = sum(t.likes for t in tweets)
-        total_retweets = sum(t.retweets for t in tweets)
-        total_replies = sum(t.replies for t in tweets)
-        total_views = sum(t.views for t in tweets if t.views)
+        # Deferred like VADER: importing numba is slow, so the app shouldn't
+        # pay for it until engagement is first requested
+        from .kernels import engagement_totals
+
+        batch = _as_batch(tweets)
+        total_likes, total_retweets, total_replies, total_views = (
+            int(total) for total in engagement_totals(batch.likes, batch.retweets, batch.replies, batch.views)
+        )
         total_interactions = total_likes + total_retweets + total_replies
         
-        num_tweets = len(tweets)
+        num_tweets = len(batch)
         avg_likes = total_likes / num_tweets
         avg_retweets = total_retweets / num_tweets
         avg_replies = total_replies / num_tweets
@@ -101,36 +135,40 @@ class TwitterAnalyzer:
             "total_impressions": total_views
         }
 
-    def get_top_hashtags(self, tweets: List[Tweet], top_n: int = 10) -> List[tuple]:
+    def get_top_hashtags(self, tweets: Tweets, top_n: int = 10) -> List[tuple]:
         """Returns top N hashtags with counts."""
-        all_hashtags = []
-        for tweet in tweets:
-            all_hashtags.extend(tweet.hashtags)
-        
-        return Counter(all_hashtags).most_common(top_n)
+        return Counter(chain.from_iterable(_as_batch(tweets).hashtags)).most_common(top_n)
     
-    def get_top_mentions(self, tweets: List[Tweet], top_n: int = 10) -> List[tuple]:
+    def get_top_mentions(self, tweets: Tweets, top_n: int = 10) -> List[tuple]:
         """Returns top N mentions with counts."""
-        all_mentions = []
-        for tweet in tweets:
-            all_mentions.extend(tweet.mentions)
-        
-        return Counter(all_mentions).most_common(top_n)
+        return Counter(chain.from_iterable(_as_batch(tweets).mentions)).most_common(top_n)
     
-    def get_tweet_type_distribution(self, tweets: List[Tweet]) -> Dict[str, int]:
+    def get_tweet_type_distribution(self, tweets: Tweets) -> Dict[str, int]:
         """Calculate distribution of original tweets vs replies."""
-        original = sum(1 for t in tweets if not t.is_reply)
-        replies = sum(1 for t in tweets if t.is_reply)
+        if isinstance(tweets, TweetBatch):
+            replies = int(tweets.is_reply.sum())
+        else:
+            # One pass over a plain list; not worth building a batch for one column
+            replies = sum(t.is_reply for t in tweets)
+        total = len(tweets)
+        original = total - replies
         
         return {
             "original_tweets": original,
             "replies": replies,
-            "original_pct": round((original / len(tweets)) * 100, 2) if tweets else 0,
-            "replies_pct": round((replies / len(tweets)) * 100, 2) if tweets else 0
+            "original_pct": round((original / total) * 100, 2) if total else 0,
+            "replies_pct": round((replies / total) * 100, 2) if total else 0
         }
 
     def export_to_csv(self, tweets: List[Tweet], filename: str):
-        """Exports tweets to CSV."""
-        df = pd.DataFrame([t.dict() for t in tweets])
-        df.to_csv(filename, index=False)
+        """Exports tweets to CSV, streaming one row at a time."""
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for t in tweets:
+                row = t.model_dump()
+                # List columns are flattened to pipe-separated strings
+                for field in CSV_LIST_FIELDS:
+                    row[field] = '|'.join(row[field])
+                writer.writerow(row)
         return filename
@@ -0,0 +1,12 @@
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from .lexicon_data import LEXICON, EMOJI_LEXICON
+
+class BakedSentimentIntensityAnalyzer(SentimentIntensityAnalyzer):
+    """VADER analyzer that uses the lexicons baked into analytics.lexicon_data.
+
+    Scoring is unchanged; only the loading step is replaced, so no text
+    files are read or parsed at runtime (see tools/bake_lexicon.py).
+    """
+    def __init__(self):
+        self.lexicon = LEXICON
+        self.emojis = EMOJI_LEXICON
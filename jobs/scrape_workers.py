@@ -0,0 +1,33 @@
+import atexit
+from typing import List, Optional, Tuple
+from scraper.core import TwitterScraper
+from models.data_models import Profile, Tweet
+
+# These run inside ProcessPoolExecutor workers. Browsers can't be shared across
+# threads or processes, so each worker process lazily opens its own and keeps
+# it for every task it is handed.
+_scraper: Optional[TwitterScraper] = None
+
+def _get_scraper() -> TwitterScraper:
+    global _scraper
+    if _scraper is None:
+        _scraper = TwitterScraper(headless=True)
+        atexit.register(_scraper.close)
+    return _scraper
+
+def scrape_seed(username: str, tweet_count: int = 0) -> Tuple[Optional[Profile], List[Tweet]]:
+    """Scrape a seed profile and, if tweet_count is set, its recent tweets"""
+    scraper = _get_scraper()
+    profile = scraper.scrape_profile(username)
+    tweets = []
+    if profile and tweet_count:
+        tweets = scraper.scrape_tweets(username, max_tweets=tweet_count)
+    return profile, tweets
+
+def scrape_profile(username: str) -> Optional[Profile]:
+    """Deep scrape a single profile"""
+    return _get_scraper().scrape_profile(username)
+
+def scrape_following(username: str, max_count: int = 20) -> List[Profile]:
+    """Scrape the accounts a user follows"""
+    return _get_scraper().scrape_following(username, max_count=max_count)
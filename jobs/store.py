@@ -0,0 +1,33 @@
+import os
+import orjson
+import redis.asyncio as redis
+from typing import Any, Dict, Optional
+
+# Job state lives in Redis so it is bounded by a TTL and shared across
+# uvicorn workers. Each job is a hash at job:{id} whose field values are
+# orjson-encoded.
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+JOB_TTL_SECONDS = 86400
+
+_redis = redis.from_url(REDIS_URL)
+
+def _key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+async def update(job_id: str, **fields: Any) -> None:
+    """Set fields on a job (creating it if needed) and refresh its expiry"""
+    key = _key(job_id)
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping={name: orjson.dumps(value) for name, value in fields.items()})
+        pipe.expire(key, JOB_TTL_SECONDS)
+        await pipe.execute()
+
+async def get(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job's fields, or None if it doesn't exist or has expired"""
+    raw = await _redis.hgetall(_key(job_id))
+    if not raw:
+        return None
+    return {name.decode(): orjson.loads(value) for name, value in raw.items()}
+
+async def close() -> None:
+    await _redis.aclose()
@@ -1,49 +1,100 @@
+import asyncio
 import logging
-import requests
-from typing import List
+import httpx
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Tuple
 from scraper.core import TwitterScraper
 from models.data_models import Tweet
 
 logger = logging.getLogger(__name__)
 
+# Shared async client for callback POSTs (closed on app shutdown). Every job
+# goes through it, so keep-alive connections are pooled across usernames
+# and jobs instead of paying a new TCP + TLS handshake per POST.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    timeout=10.0
+)
+
+# Max callback POSTs in flight per job
+MAX_CONCURRENT_SAVES = 8
+
+# Profiles per bulk callback when discovery saves tweets
+CALLBACK_BATCH_SIZE = 5
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 def sync_influencer_tweets(username: str, scraper: TwitterScraper) -> List[Tweet]:
     """Scrape recent tweets for a specific influencer"""
     try:
         logger.info(f"Syncing tweets for @{username}")
-        tweets = scraper.scrape_tweets(username, count=20)
+        tweets = scraper.scrape_tweets(username, max_tweets=20)
         return tweets
     except Exception as e:
         logger.error(f"Error syncing tweets for @{username}: {str(e)}")
         return []
 
-def run_tweet_sync_job(job_id: str, usernames: List[str], callback_url: str, user_id: str):
+async def save_tweets(username: str, tweets: List[Tweet], callback_url: str, user_id: str, semaphore: asyncio.Semaphore) -> int:
+    """Send scraped tweets to the Next.js API, returning how many were saved"""
+    async with semaphore:
+        try:
+            # Serialize with orjson and send raw bytes so the client doesn't re-encode
+            body = orjson.dumps({
+                "username": username,
+                "tweets": [t.model_dump(mode="json") for t in tweets],
+                "user_id": user_id
+            })
+            # Assuming callback_url is something like http://localhost:3000/api/tweets/save
+            response = await http_client.post(callback_url, content=body, headers=JSON_HEADERS)
+            if response.status_code == 200:
+                logger.info(f"Saved {len(tweets)} tweets for @{username}")
+                return len(tweets)
+            logger.error(f"Failed to save tweets for @{username}: {response.text}")
+        except Exception as e:
+            logger.error(f"Error sending tweets to API for @{username}: {str(e)}")
+        return 0
+
+async def save_tweet_batch(items: List[Tuple[str, List[Tweet]]], callback_url: str, user_id: str, semaphore: asyncio.Semaphore) -> int:
+    """Send tweets for several users in one bulk call to {callback_url}/batch"""
+    async with semaphore:
+        usernames = ", ".join(f"@{username}" for username, _ in items)
+        try:
+            body = orjson.dumps({
+                "user_id": user_id,
+                "items": [
+                    {"username": username, "tweets": [t.model_dump(mode="json") for t in tweets]}
+                    for username, tweets in items
+                ]
+            })
+            response = await http_client.post(f"{callback_url.rstrip('/')}/batch", content=body, headers=JSON_HEADERS)
+            if response.status_code == 200:
+                saved = sum(len(tweets) for _, tweets in items)
+                logger.info(f"Saved {saved} tweets for {usernames}")
+                return saved
+            logger.error(f"Failed to save tweets for {usernames}: {response.text}")
+        except Exception as e:
+            logger.error(f"Error sending tweets to API for {usernames}: {str(e)}")
+        return 0
+
+async def run_tweet_sync_job(job_id: str, usernames: List[str], callback_url: str, user_id: str):
     """Background task to sync tweets for multiple influencers"""
     logger.info(f"Starting sync job {job_id} for {len(usernames)} influencers")
-    
-    scraper = TwitterScraper(headless=True)
+
+    scraper = await run_in_threadpool(TwitterScraper, headless=True)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SAVES)
+    saves = []
     total_tweets = 0
-    
+
     try:
         for username in usernames:
-            tweets = sync_influencer_tweets(username, scraper)
+            # The browser is blocking and single-threaded, so scrapes run one at a
+            # time off the event loop while earlier callbacks are still in flight
+            tweets = await run_in_threadpool(sync_influencer_tweets, username, scraper)
             if tweets:
-                # Send to Next.js API to save
-                try:
-                    payload = {
-                        "username": username,
-                        "tweets": [t.dict() for t in tweets],
-                        "user_id": user_id
-                    }
-                    # Assuming callback_url is something like http://localhost:3000/api/tweets/save
-                    response = requests.post(callback_url, json=payload)
-                    if response.status_code == 200:
-                        logger.info(f"Saved {len(tweets)} tweets for @{username}")
-                        total_tweets += len(tweets)
-                    else:
-                        logger.error(f"Failed to save tweets for @{username}: {response.text}")
-                except Exception as e:
-                    logger.error(f"Error sending tweets to API for @{username}: {str(e)}")
-            
+                saves.append(asyncio.create_task(save_tweets(username, tweets, callback_url, user_id, semaphore)))
+
     finally:
-        scraper.close()
+        total_tweets = sum(await asyncio.gather(*saves))
+        await run_in_threadpool(scraper.close)
         logger.info(f"Sync job {job_id} complete. Total tweets saved: {total_tweets}")
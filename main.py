@@ -1,15 +1,24 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any, Literal, get_args
 import uvicorn
+import asyncio
+import heapq
+import multiprocessing
 import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from scraper.core import TwitterScraper
+from scraper.core import TwitterScraper, prepare_driver_binary
 from analytics.engine import TwitterAnalyzer
+from analytics.batch import TweetBatch
 from models.data_models import Tweet, Profile
+from jobs.tweet_sync import run_tweet_sync_job, save_tweet_batch, http_client, MAX_CONCURRENT_SAVES, CALLBACK_BATCH_SIZE
+from jobs import scrape_workers, store
 
 import logging
 
@@ -20,7 +29,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Twitter Headless Scraper API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shared clients live for the whole app; close them on shutdown
+    await http_client.aclose()
+    await store.close()
+
+app = FastAPI(title="Twitter Headless Scraper API", lifespan=lifespan)
 
 # CRITICAL: Add CORS middleware FIRST, before any routes
 app.add_middleware(
@@ -34,18 +50,19 @@ app.add_middleware(
 
 analyzer = TwitterAnalyzer()
 
-# In-memory job storage (use Redis/database in production)
-jobs: Dict[str, Dict[str, Any]] = {}
-
 # Request Models
 class ScrapeRequest(BaseModel):
     username: str
     max_tweets: int = 20
 
+AnalysisType = Literal["sentiment", "engagement", "hashtags", "mentions", "tweet_types"]
+
 class AnalyticsRequest(BaseModel):
     username: str
     tweets: List[Tweet]
     profile: Optional[Profile] = None
+    # Analyses to run; None runs all of them
+    include: Optional[List[AnalysisType]] = None
 
 class DiscoverRequest(BaseModel):
     usernames: List[str]
@@ -55,18 +72,17 @@ class SyncRequest(BaseModel):
     callback_url: str
     user_id: str
 
-from jobs.tweet_sync import run_tweet_sync_job
-
 @app.get("/")
 def read_root():
     return {"status": "online", "service": "Twitter Headless Scraper"}
 
 @app.get("/profile/{username}", response_model=Profile)
-def get_profile(username: str):
-    scraper = TwitterScraper(headless=True)
+async def get_profile(username: str):
+    # Selenium is blocking, so every browser call is pushed to the threadpool
+    scraper = await run_in_threadpool(TwitterScraper, headless=True)
     try:
         logger.info(f"Received request to scrape profile: {username}")
-        profile = scraper.scrape_profile(username)
+        profile = await run_in_threadpool(scraper.scrape_profile, username)
         if not profile:
             logger.error(f"Failed to scrape profile for {username}")
             raise HTTPException(status_code=404, detail="Profile not found or scraping failed")
@@ -76,61 +92,98 @@ def get_profile(username: str):
         logger.error(f"Unexpected error in get_profile: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        scraper.close()
+        await run_in_threadpool(scraper.close)
 
 @app.post("/tweets", response_model=List[Tweet])
-def get_tweets(request: ScrapeRequest):
-    scraper = TwitterScraper(headless=True)
+async def get_tweets(request: ScrapeRequest):
+    scraper = await run_in_threadpool(TwitterScraper, headless=True)
     try:
         logger.info(f"Received request to scrape tweets for: {request.username}")
-        tweets = scraper.scrape_tweets(request.username, request.max_tweets)
+        tweets = await run_in_threadpool(scraper.scrape_tweets, request.username, request.max_tweets)
         logger.info(f"Successfully scraped {len(tweets)} tweets for {request.username}")
         return tweets
     except Exception as e:
         logger.error(f"Unexpected error in get_tweets: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        scraper.close()
+        await run_in_threadpool(scraper.close)
 
 @app.post("/analyze")
 def analyze_tweets(request: AnalyticsRequest):
-    sentiment = analyzer.analyze_sentiment(request.tweets)
-    hashtags = analyzer.get_top_hashtags(request.tweets)
+    # Plain def: the analyzers are CPU-bound, so FastAPI runs this in its
+    # threadpool instead of blocking the event loop
+    wanted = set(request.include) if request.include is not None else set(get_args(AnalysisType))
+    # Convert once and share the columnar batch across every analyzer
+    batch = TweetBatch.from_tweets(request.tweets)
+    result = {}
     
-    engagement = {}
-    if request.profile:
-        engagement = analyzer.calculate_engagement(request.profile, request.tweets)
-    
-    tweet_types = analyzer.get_tweet_type_distribution(request.tweets)
-    mentions = analyzer.get_top_mentions(request.tweets)
+    if "sentiment" in wanted:
+        result["sentiment"] = analyzer.analyze_sentiment(batch)
+    if "engagement" in wanted:
+        result["engagement"] = {}
+        if request.profile:
+            result["engagement"] = analyzer.calculate_engagement(request.profile, batch)
+    if "hashtags" in wanted:
+        result["top_hashtags"] = analyzer.get_top_hashtags(batch)
+    if "mentions" in wanted:
+        result["top_mentions"] = analyzer.get_top_mentions(batch)
+    if "tweet_types" in wanted:
+        result["tweet_types"] = analyzer.get_tweet_type_distribution(batch)
         
-    return {
-        "sentiment": sentiment,
-        "engagement": engagement,
-        "top_hashtags": hashtags,
-        "top_mentions": mentions,
-        "tweet_types": tweet_types
-    }
+    return result
 
 class DiscoverRequest(BaseModel):
     usernames: List[str]
     user_id: Optional[str] = None
     callback_url: Optional[str] = None
 
-def run_discovery_job(job_id: str, usernames: List[str], user_id: Optional[str] = None, callback_url: Optional[str] = None):
+# Browser processes used to parallelize discovery
+DISCOVERY_WORKERS = 4
+
+async def _in_pool(pool: ProcessPoolExecutor, tag: Any, fn, *args):
+    """Run a scrape worker in the pool, returning (tag, result, error)"""
+    loop = asyncio.get_running_loop()
+    try:
+        return tag, await loop.run_in_executor(pool, fn, *args), None
+    except Exception as e:
+        return tag, None, e
+
+async def run_discovery_job(job_id: str, usernames: List[str], user_id: Optional[str] = None, callback_url: Optional[str] = None):
     """Background task to run influencer discovery"""
     try:
-        jobs[job_id]["status"] = "running"
-        jobs[job_id]["started_at"] = datetime.now().isoformat()
+        await store.update(job_id, status="running", started_at=datetime.now().isoformat())
         
         logger.info("="*80)
         logger.info(f"🚀 JOB {job_id}: STARTING DISCOVERY")
         logger.info(f"📝 Usernames: {usernames}")
         logger.info("="*80)
             
-        scraper = TwitterScraper(headless=True)
         discovered_profiles = []
         seen_usernames = set()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SAVES)
+        saves = []
+        pending_tweets = []
+
+        def flush_tweets():
+            # Hand buffered tweets to one bulk callback instead of a POST per profile
+            nonlocal pending_tweets
+            if pending_tweets:
+                saves.append(asyncio.create_task(save_tweet_batch(pending_tweets, callback_url, user_id, semaphore)))
+                pending_tweets = []
+
+        # Dedupe seeds up front, keeping the order they were given in
+        seeds = list(dict.fromkeys(usernames))
+        if len(seeds) < len(usernames):
+            logger.warning(f"⚠️  Skipping {len(usernames) - len(seeds)} duplicate usernames")
+
+        # Each worker process owns its own browser, so seeds and deep scrapes
+        # run in parallel up to the pool size. Patch chromedriver here first so
+        # the workers' browsers all reuse it instead of racing to re-patch it.
+        await run_in_threadpool(prepare_driver_binary)
+        pool = ProcessPoolExecutor(
+            max_workers=min(DISCOVERY_WORKERS, len(seeds)),
+            mp_context=multiprocessing.get_context("spawn")
+        )
         
         try:
             # 1. Scrape Seed Profiles
@@ -138,45 +191,38 @@ def run_discovery_job(job_id: str, usernames: List[str], user_id: Optional[str]
             logger.info("PHASE 1: Scraping seed profiles")
             logger.info("="*80)
             
-            for idx, username in enumerate(usernames, 1):
-                if username in seen_usernames:
-                    logger.warning(f"⚠️  [{idx}/{len(usernames)}] Skipping duplicate: @{username}")
+            tweet_count = 10 if user_id and callback_url else 0
+            tasks = [
+                asyncio.create_task(_in_pool(pool, username, scrape_workers.scrape_seed, username, tweet_count))
+                for username in seeds
+            ]
+            await store.update(job_id, progress=f"Scraping {len(seeds)} seed profiles")
+            
+            for idx, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                username, result, error = await next_done
+                logger.info(f"\n🔍 [{idx}/{len(seeds)}] Scraped seed profile: @{username}")
+                await store.update(job_id, progress=f"Scraped seed profile {idx}/{len(seeds)}: @{username}")
+                
+                if error:
+                    logger.error(f"   ❌ Error scraping @{username}: {str(error)}")
+                    continue
+                    
+                profile, tweets = result
+                if not profile:
+                    logger.error(f"   ❌ Failed to scrape @{username}")
                     continue
                     
-                logger.info(f"\n🔍 [{idx}/{len(usernames)}] Scraping seed profile: @{username}")
-                jobs[job_id]["progress"] = f"Scraping seed profile {idx}/{len(usernames)}: @{username}"
+                discovered_profiles.append(profile)
+                seen_usernames.add(profile.username)
+                logger.info(f"   ✅ Success! Followers: {profile.followers_count:,}")
                 
-                try:
-                    profile = scraper.scrape_profile(username)
-                    if profile:
-                        discovered_profiles.append(profile)
-                        seen_usernames.add(profile.username)
-                        logger.info(f"   ✅ Success! Followers: {profile.followers_count:,}")
-                        
-                        # Scrape and save tweets immediately if user_id and callback_url are provided
-                        if user_id and callback_url:
-                            try:
-                                logger.info(f"   🐦 Scraping recent tweets for @{username}...")
-                                tweets = scraper.scrape_tweets(username, count=10)
-                                if tweets:
-                                    payload = {
-                                        "username": username,
-                                        "tweets": [t.dict() for t in tweets],
-                                        "user_id": user_id
-                                    }
-                                    resp = requests.post(callback_url, json=payload)
-                                    if resp.status_code == 200:
-                                        logger.info(f"      ✅ Saved {len(tweets)} tweets")
-                                    else:
-                                        logger.error(f"      ❌ Failed to save tweets: {resp.text}")
-                            except Exception as te:
-                                logger.error(f"      ❌ Error scraping tweets: {str(te)}")
-                                
-                    else:
-                        logger.error(f"   ❌ Failed to scrape @{username}")
-                except Exception as e:
-                    logger.error(f"   ❌ Error scraping @{username}: {str(e)}")
+                # Save tweets in batches if user_id and callback_url are provided
+                if tweets:
+                    pending_tweets.append((username, tweets))
+                    if len(pending_tweets) >= CALLBACK_BATCH_SIZE:
+                        flush_tweets()
                     
+            flush_tweets()
             logger.info(f"\n✅ Phase 1 complete: Scraped {len(discovered_profiles)} seed profiles")
             
             # 2. Discover Network
@@ -185,60 +231,74 @@ def run_discovery_job(job_id: str, usernames: List[str], user_id: Optional[str]
             logger.info("="*80)
             
             target_total = 25
+            target_per_seed = 4
             profiles_before_discovery = len(discovered_profiles)
             
-            for idx, username in enumerate(usernames, 1):
-                if len(discovered_profiles) >= target_total:
-                    logger.info(f"\n🎯 Reached target of {target_total} profiles.")
-                    break
-                    
-                logger.info(f"\n🔍 [{idx}/{len(usernames)}] Discovering network for: @{username}")
-                jobs[job_id]["progress"] = f"Discovering network {idx}/{len(usernames)}: @{username}"
+            if len(discovered_profiles) >= target_total:
+                logger.info(f"\n🎯 Reached target of {target_total} profiles.")
+            else:
+                logger.info(f"   📡 Fetching following lists for {len(seeds)} seeds...")
+                await store.update(job_id, progress=f"Discovering network for {len(seeds)} seeds")
+                following_lists = await asyncio.gather(*[
+                    _in_pool(pool, username, scrape_workers.scrape_following, username, 10)
+                    for username in seeds
+                ])
+                
+                # Queue at most target_per_seed unseen accounts per seed, and no more
+                # than are still needed to reach the target
+                queued = set(seen_usernames)
+                remaining = target_total - len(discovered_profiles)
+                tasks = []
+                for username, following, error in following_lists:
+                    if len(tasks) >= remaining:
+                        break
+                    if error:
+                        logger.error(f"   ❌ Error fetching following for @{username}: {str(error)}")
+                        continue
+                    candidates = [p for p in following if p.username not in queued][:target_per_seed]
+                    logger.info(f"   ✅ Found {len(following)} accounts followed by @{username}, {len(candidates)} new")
+                    for p in candidates[:remaining - len(tasks)]:
+                        queued.add(p.username)
+                        tasks.append(asyncio.create_task(
+                            _in_pool(pool, (username, p.username), scrape_workers.scrape_profile, p.username)
+                        ))
                 
                 try:
-                    logger.info(f"   📡 Fetching following list...")
-                    following = scraper.scrape_following(username, max_count=10)
-                    logger.info(f"   ✅ Found {len(following)} accounts")
-                    
-                    count = 0
-                    target_per_seed = 4
-                    
-                    for f_idx, p in enumerate(following, 1):
-                        if p.username not in seen_usernames and len(discovered_profiles) < target_total:
-                            logger.info(f"   🔎 [{f_idx}/{len(following)}] Deep scraping: @{p.username}")
-                            jobs[job_id]["progress"] = f"Network {idx}/{len(usernames)}: Scraping @{p.username} ({len(discovered_profiles)}/{target_total})"
+                    for next_done in asyncio.as_completed(tasks):
+                        (username, handle), full_p, error = await next_done
+                        if error:
+                            logger.error(f"      ❌ Error scraping @{handle}: {str(error)}")
+                            continue
+                        if not full_p:
+                            logger.warning(f"      ⚠️  Failed to scrape @{handle}")
+                            continue
                             
-                            try:
-                                full_p = scraper.scrape_profile(p.username)
-                                if full_p:
-                                    discovered_profiles.append(full_p)
-                                    seen_usernames.add(full_p.username)
-                                    count += 1
-                                    logger.info(f"      ✅ Added! Total: {len(discovered_profiles)}")
-                                else:
-                                    logger.warning(f"      ⚠️  Failed")
-                            except Exception as e:
-                                logger.error(f"      ❌ Error: {str(e)}")
-                                
-                            if count >= target_per_seed:
-                                logger.info(f"   ✅ Reached {target_per_seed} from @{username}")
-                                break
-                                
-                except Exception as e:
-                    logger.error(f"   ❌ Error: {str(e)}")
+                        discovered_profiles.append(full_p)
+                        seen_usernames.add(full_p.username)
+                        logger.info(f"      ✅ Added @{handle} via @{username}! Total: {len(discovered_profiles)}")
+                        await store.update(job_id, progress=f"Network: Scraped @{handle} ({len(discovered_profiles)}/{target_total})")
+                        
+                        if len(discovered_profiles) >= target_total:
+                            logger.info(f"\n🎯 Reached target of {target_total} profiles.")
+                            break
+                finally:
+                    # Drop deep scrapes that are no longer needed
+                    for task in tasks:
+                        task.cancel()
             
             new_discoveries = len(discovered_profiles) - profiles_before_discovery
             logger.info(f"\n✅ Phase 2 complete: Discovered {new_discoveries} additional profiles")
                             
         finally:
-            logger.info("\n🔒 Closing browser...")
-            scraper.close()
-            logger.info("✅ Browser closed")
+            logger.info("\n🔒 Shutting down browser pool...")
+            # Workers close their browsers on exit; don't block the loop waiting for them
+            pool.shutdown(wait=False, cancel_futures=True)
+            flush_tweets()
+            await asyncio.gather(*saves)
             
-        # Sort by followers count
+        # Keep the top 25 by followers count (partial sort)
         logger.info("\n📊 Sorting profiles...")
-        discovered_profiles.sort(key=lambda x: x.followers_count, reverse=True)
-        final_profiles = discovered_profiles[:25]
+        final_profiles = heapq.nlargest(25, discovered_profiles, key=lambda p: p.followers_count)
         
         logger.info("\n" + "="*80)
         logger.info(f"🎉 JOB {job_id}: COMPLETE!")
@@ -246,36 +306,38 @@ def run_discovery_job(job_id: str, usernames: List[str], user_id: Optional[str]
         logger.info("="*80)
         
         # Convert to dict for JSON serialization
-        profiles_dict = [p.model_dump() for p in final_profiles]
+        profiles_dict = [p.model_dump(mode="json") for p in final_profiles]
         
-        jobs[job_id]["status"] = "completed"
-        jobs[job_id]["result"] = profiles_dict
-        jobs[job_id]["progress"] = f"Completed! Discovered {len(final_profiles)} profiles"
-        jobs[job_id]["completed_at"] = datetime.now().isoformat()
+        await store.update(
+            job_id,
+            status="completed",
+            result=profiles_dict,
+            progress=f"Completed! Discovered {len(final_profiles)} profiles",
+            completed_at=datetime.now().isoformat()
+        )
         
     except Exception as e:
         logger.error(f"\n❌ JOB {job_id} FAILED: {str(e)}", exc_info=True)
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["error"] = str(e)
-        jobs[job_id]["completed_at"] = datetime.now().isoformat()
+        await store.update(job_id, status="failed", error=str(e), completed_at=datetime.now().isoformat())
 
 @app.post("/discover")
-def start_discovery_job(request: DiscoverRequest, background_tasks: BackgroundTasks):
+async def start_discovery_job(request: DiscoverRequest, background_tasks: BackgroundTasks):
     """Start a background discovery job and return job ID immediately"""
     if not request.usernames:
         raise HTTPException(status_code=400, detail="At least 1 username is required")
     
     # Create job
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "id": job_id,
-        "status": "pending",
-        "progress": "Job created, starting soon...",
-        "usernames": request.usernames,
-        "created_at": datetime.now().isoformat(),
-        "result": None,
-        "error": None
-    }
+    await store.update(
+        job_id,
+        id=job_id,
+        status="pending",
+        progress="Job created, starting soon...",
+        usernames=request.usernames,
+        created_at=datetime.now().isoformat(),
+        result=None,
+        error=None
+    )
     
     # Start background task
     background_tasks.add_task(run_discovery_job, job_id, request.usernames, request.user_id, request.callback_url)
@@ -289,13 +351,12 @@ def start_discovery_job(request: DiscoverRequest, background_tasks: BackgroundTa
     }
 
 @app.get("/jobs/{job_id}")
-def get_job_status(job_id: str):
+async def get_job_status(job_id: str):
     """Get the status of a discovery job"""
-    if job_id not in jobs:
+    job = await store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     return {
         "id": job["id"],
         "status": job["status"],
@@ -308,21 +369,22 @@ def get_job_status(job_id: str):
     }
 
 @app.post("/sync-tweets")
-def start_tweet_sync_job(request: SyncRequest, background_tasks: BackgroundTasks):
+async def start_tweet_sync_job(request: SyncRequest, background_tasks: BackgroundTasks):
     """Start a background job to sync tweets for multiple influencers"""
     if not request.usernames:
         raise HTTPException(status_code=400, detail="Usernames list cannot be empty")
     
     # Create job
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "id": job_id,
-        "status": "pending",
-        "type": "sync_tweets",
-        "progress": "Job created, starting soon...",
-        "usernames": request.usernames,
-        "created_at": datetime.now().isoformat(),
-    }
+    await store.update(
+        job_id,
+        id=job_id,
+        status="pending",
+        type="sync_tweets",
+        progress="Job created, starting soon...",
+        usernames=request.usernames,
+        created_at=datetime.now().isoformat()
+    )
     
     # Start background task
     background_tasks.add_task(run_tweet_sync_job, job_id, request.usernames, request.callback_url, request.user_id)
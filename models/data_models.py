@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime
 
 class Tweet(BaseModel):
+    # Scraped records are never modified after construction
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[str] = None
     text: str
     username: str
@@ -24,6 +27,8 @@ class Tweet(BaseModel):
     url: Optional[str] = None
 
 class Profile(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     username: str
     full_name: Optional[str] = None
     bio: Optional[str] = None
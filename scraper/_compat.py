@@ -0,0 +1,16 @@
+import sys
+
+def patch_distutils():
+    """Patch distutils for Python 3.12+ compatibility.
+
+    undetected_chromedriver still imports distutils, which 3.12 removed, so
+    point it at setuptools' copy. This imports setuptools, which is slow, so
+    call it only right before importing undetected_chromedriver.
+    """
+    if sys.version_info >= (3, 12) and 'distutils' not in sys.modules:
+        import setuptools
+        try:
+            from setuptools import distutils
+        except ImportError:
+            import distutils
+        sys.modules['distutils'] = distutils
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import httpx
+import orjson
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    API_BASE_URL, API_BEARER_TOKEN, API_PAGE_SIZE, API_TIMEOUT,
+    GRAPHQL_FEATURES, GRAPHQL_QUERY_IDS, GUEST_ACTIVATE_URL
+)
+from models.data_models import Profile, Tweet
+
+logger = logging.getLogger(__name__)
+
+# Guest access revoked/expired (401/403) or a stale query id (404): the API
+# won't serve us, so callers should use the browser instead
+UNAVAILABLE_STATUSES = {401, 403, 404}
+
+FEATURES_PARAM = orjson.dumps(GRAPHQL_FEATURES).decode()
+
+TWITTER_TIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+class ApiUnavailableError(Exception):
+    """The GraphQL API refused the request; scrape with the browser instead"""
+
+def _reformat_time(created_at: Optional[str], fmt: str) -> Optional[str]:
+    if not created_at:
+        return None
+    return datetime.strptime(created_at, TWITTER_TIME_FORMAT).strftime(fmt)
+
+def _timeline_page(instructions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Flatten timeline instructions into item contents and the bottom cursor"""
+    items = []
+    cursor = None
+    for instruction in instructions:
+        entries = instruction.get("entries") or ([instruction["entry"]] if "entry" in instruction else [])
+        for entry in entries:
+            content = entry.get("content", {})
+            if content.get("cursorType") == "Bottom":
+                cursor = content.get("value")
+            elif "itemContent" in content:
+                items.append(content["itemContent"])
+            else:
+                # Conversation modules group several tweets in one entry
+                items.extend(i["item"]["itemContent"] for i in content.get("items", []) if "itemContent" in i.get("item", {}))
+    return items, cursor
+
+# Plain dict walks over the decoded JSON: the shapes are fixed and only a
+# handful of fields are read, so no generic normalization is needed
+
+def _pluck_profile(user: Dict[str, Any]) -> Optional[Profile]:
+    """Profile from a user_results.result object"""
+    legacy = user.get("legacy")
+    if not legacy:
+        return None
+    urls = legacy.get("entities", {}).get("url", {}).get("urls", [])
+    avatar = legacy.get("profile_image_url_https")
+    return Profile(
+        username=legacy["screen_name"],
+        full_name=legacy.get("name"),
+        bio=legacy.get("description") or None,
+        description=legacy.get("description") or None,
+        location=legacy.get("location") or None,
+        website=urls[0].get("expanded_url") if urls else None,
+        followers_count=legacy.get("followers_count", 0),
+        following_count=legacy.get("friends_count", 0),
+        tweets_count=legacy.get("statuses_count", 0),
+        join_date=_reformat_time(legacy.get("created_at"), "Joined %B %Y"),
+        is_verified=user.get("is_blue_verified", False) or legacy.get("verified", False),
+        # Ask for the same full-size avatar the profile page shows
+        profile_image_url=avatar.replace("_normal.", "_400x400.") if avatar else None,
+        banner_image_url=legacy.get("profile_banner_url")
+    )
+
+def _pluck_tweet(result: Dict[str, Any], username: str) -> Optional[Tweet]:
+    """Tweet from a tweet_results.result object, counts taken as-is from legacy"""
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    legacy = result.get("legacy")
+    if not legacy:
+        # Tombstones and unavailable tweets
+        return None
+
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    user_legacy = user.get("legacy", {})
+    entities = legacy.get("entities", {})
+    media = legacy.get("extended_entities", entities).get("media", [])
+    views = result.get("views", {}).get("count")
+    tweet_id = legacy.get("id_str") or result.get("rest_id")
+    reply_to = legacy.get("in_reply_to_screen_name")
+
+    return Tweet(
+        id=tweet_id,
+        text=legacy.get("full_text", ""),
+        username=username,
+        full_name=user_legacy.get("name"),
+        timestamp=_reformat_time(legacy.get("created_at"), "%Y-%m-%dT%H:%M:%S.000Z"),
+        likes=legacy.get("favorite_count", 0),
+        retweets=legacy.get("retweet_count", 0),
+        replies=legacy.get("reply_count", 0),
+        views=int(views) if views else 0,
+        bookmarks=legacy.get("bookmark_count", 0),
+        quotes=legacy.get("quote_count", 0),
+        hashtags=[h["text"] for h in entities.get("hashtags", [])],
+        mentions=[m["screen_name"] for m in entities.get("user_mentions", [])],
+        media_urls=[m["media_url_https"] for m in media if "media_url_https" in m],
+        is_verified=user.get("is_blue_verified", False) or user_legacy.get("verified", False),
+        is_reply=reply_to is not None,
+        reply_to=f"@{reply_to}" if reply_to else None,
+        profile_image=user_legacy.get("profile_image_url_https"),
+        url=f"https://twitter.com/{user_legacy.get('screen_name', username)}/status/{tweet_id}"
+    )
+
+class TwitterApiClient:
+    """Async client for the GraphQL endpoints the twitter.com web app calls.
+
+    Returns the same Profile/Tweet models as the Selenium scraper, without
+    rendering or parsing any HTML. Lookups return None when the API doesn't
+    resolve the user, so callers can retry in the browser. Raises
+    ApiUnavailableError when guest access is refused.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self._client = client or httpx.AsyncClient(http2=True, timeout=API_TIMEOUT)
+        self._client.headers.update({
+            "authorization": f"Bearer {API_BEARER_TOKEN}",
+            "x-twitter-active-user": "yes",
+            "x-twitter-client-language": "en"
+        })
+        self._guest_token: Optional[str] = None
+        self._activate_lock = asyncio.Lock()
+        self._user_ids: Dict[str, str] = {}
+
+    async def _activate(self):
+        response = await self._client.post(GUEST_ACTIVATE_URL)
+        if response.status_code in UNAVAILABLE_STATUSES:
+            raise ApiUnavailableError(f"guest activation returned {response.status_code}")
+        response.raise_for_status()
+        self._guest_token = orjson.loads(response.content)["guest_token"]
+
+    async def _graphql(self, operation: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{API_BASE_URL}/{GRAPHQL_QUERY_IDS[operation]}/{operation}"
+        params = {"variables": orjson.dumps(variables).decode(), "features": FEATURES_PARAM}
+
+        # Guest tokens expire, so retry once with a fresh one before giving up
+        for _ in range(2):
+            if self._guest_token is None:
+                # Concurrent calls share one activation
+                async with self._activate_lock:
+                    if self._guest_token is None:
+                        await self._activate()
+            response = await self._client.get(url, params=params, headers={"x-guest-token": self._guest_token})
+            if response.status_code not in UNAVAILABLE_STATUSES:
+                response.raise_for_status()
+                return orjson.loads(response.content)
+            self._guest_token = None
+
+        raise ApiUnavailableError(f"{operation} returned {response.status_code}")
+
+    async def _get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        data = await self._graphql("UserByScreenName", {"screen_name": username, "withSafetyModeUserFields": True})
+        user = data.get("data", {}).get("user", {}).get("result")
+        if not user or user.get("__typename") != "User":
+            return None
+        self._user_ids[username.lower()] = user["rest_id"]
+        return user
+
+    async def _get_user_id(self, username: str) -> Optional[str]:
+        key = username.lower()
+        if key not in self._user_ids and not await self._get_user(username):
+            return None
+        return self._user_ids[key]
+
+    async def get_profile(self, username: str) -> Optional[Profile]:
+        user = await self._get_user(username)
+        return _pluck_profile(user) if user else None
+
+    async def get_user_tweets(self, username: str, max_tweets: int = 20) -> Optional[List[Tweet]]:
+        user_id = await self._get_user_id(username)
+        if user_id is None:
+            return None
+
+        tweets = []
+        seen_ids = set()
+        cursor = None
+        while len(tweets) < max_tweets:
+            variables = {
+                "userId": user_id,
+                "count": API_PAGE_SIZE,
+                "includePromotedContent": False,
+                "withQuickPromoteEligibilityTweetFields": False,
+                "withVoice": True,
+                "withV2Timeline": True
+            }
+            if cursor:
+                variables["cursor"] = cursor
+            data = await self._graphql("UserTweets", variables)
+            instructions = data["data"]["user"]["result"]["timeline_v2"]["timeline"]["instructions"]
+            items, cursor = _timeline_page(instructions)
+
+            found = 0
+            for item in items:
+                result = item.get("tweet_results", {}).get("result")
+                tweet = _pluck_tweet(result, username) if result else None
+                if tweet and tweet.id not in seen_ids:
+                    seen_ids.add(tweet.id)
+                    tweets.append(tweet)
+                    found += 1
+            if not found or not cursor:
+                break
+
+        tweets = tweets[:max_tweets]
+        logger.info("Fetched %d tweets for @%s from the API", len(tweets), username)
+        return tweets
+
+    async def get_following(self, username: str, max_count: int = 20) -> Optional[List[Profile]]:
+        user_id = await self._get_user_id(username)
+        if user_id is None:
+            return None
+
+        profiles = []
+        seen_usernames = set()
+        cursor = None
+        while len(profiles) < max_count:
+            variables = {"userId": user_id, "count": API_PAGE_SIZE, "includePromotedContent": False}
+            if cursor:
+                variables["cursor"] = cursor
+            data = await self._graphql("Following", variables)
+            instructions = data["data"]["user"]["result"]["timeline"]["timeline"]["instructions"]
+            items, cursor = _timeline_page(instructions)
+
+            found = 0
+            for item in items:
+                user = item.get("user_results", {}).get("result")
+                profile = _pluck_profile(user) if user else None
+                if profile and profile.username not in seen_usernames:
+                    seen_usernames.add(profile.username)
+                    profiles.append(profile)
+                    found += 1
+            if not found or not cursor:
+                break
+
+        profiles = profiles[:max_count]
+        logger.info("Fetched %d following for @%s from the API", len(profiles), username)
+        return profiles
+
+    async def aclose(self):
+        await self._client.aclose()
@@ -1,9 +1,19 @@
 # Scraper Configuration
+import os
 
 # Browser Settings
 HEADLESS = True
 WINDOW_SIZE = "1920,1080"
 USER_AGENT_ROTATION = True
+# Upper bound on browsers opened for a concurrent batch (scrape_profiles)
+MAX_BROWSER_WORKERS = 8
+# Resources the browser never needs to fetch: we only read img src
+# attributes, never the bytes
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.mp4", "*.m3u8", "*.woff", "*.woff2", "*.ttf",
+    "*video.twimg.com*", "*ads-twitter.com*"
+]
 
 # Timeouts (seconds)
 PAGE_LOAD_TIMEOUT = 30
@@ -30,6 +40,9 @@ SELECTORS = {
             "view": '[data-testid="app-text-transition-container"]' # Often used for views
         }
     },
+    "following": {
+        "cell": '[data-testid="UserCell"]'
+    },
     "login": {
         "username_field": 'input[autocomplete="username"]',
         "password_field": 'input[autocomplete="current-password"]',
@@ -41,3 +54,54 @@ SELECTORS = {
 # Anti-Detection
 MIN_DELAY = 2
 MAX_DELAY = 5
+
+# GraphQL API
+# Opt-in with USE_GRAPHQL_API=1. When on it is tried before the browser, and
+# any call it can't serve falls back to Selenium.
+USE_GRAPHQL_API = os.environ.get("USE_GRAPHQL_API", "0") == "1"
+API_TIMEOUT = 10.0
+API_PAGE_SIZE = 20
+API_BASE_URL = "https://twitter.com/i/api/graphql"
+GUEST_ACTIVATE_URL = "https://api.twitter.com/1.1/guest/activate.json"
+# Public bearer token embedded in the twitter.com web client
+API_BEARER_TOKEN = os.environ.get(
+    "TWITTER_BEARER_TOKEN",
+    "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+)
+# Query ids change when X redeploys its web client. If calls start
+# returning 404, copy the current ids from the web app's main.js.
+GRAPHQL_QUERY_IDS = {
+    "UserByScreenName": "G3KGOASz96M-Qu0nwmGXNg",
+    "UserTweets": "E3opETHurmVJflFsUBVuUQ",
+    "Following": "iSicc7LrzWGBgDPL0tM_TQ"
+}
+# Feature flags the endpoints require alongside the query variables
+GRAPHQL_FEATURES = {
+    "hidden_profile_likes_enabled": True,
+    "hidden_profile_subscriptions_enabled": True,
+    "highlights_tweets_tab_ui_enabled": True,
+    "subscriptions_verification_info_verified_since_enabled": True,
+    "subscriptions_verification_info_is_identity_verified_enabled": True,
+    "rweb_tipjar_consumption_enabled": True,
+    "responsive_web_graphql_exclude_directive_enabled": True,
+    "verified_phone_label_enabled": False,
+    "creator_subscriptions_tweet_preview_api_enabled": True,
+    "creator_subscriptions_quote_tweet_preview_enabled": False,
+    "responsive_web_graphql_timeline_navigation_enabled": True,
+    "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+    "c9s_tweet_anatomy_moderator_badge_enabled": True,
+    "tweetypie_unmention_optimization_enabled": True,
+    "responsive_web_edit_tweet_api_enabled": True,
+    "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+    "view_counts_everywhere_api_enabled": True,
+    "longform_notetweets_consumption_enabled": True,
+    "responsive_web_twitter_article_tweet_consumption_enabled": False,
+    "tweet_awards_web_tipping_enabled": False,
+    "freedom_of_speech_not_reach_fetch_enabled": True,
+    "standardized_nudges_misinfo": True,
+    "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
+    "longform_notetweets_rich_text_read_enabled": True,
+    "longform_notetweets_inline_media_enabled": True,
+    "responsive_web_media_download_video_enabled": False,
+    "responsive_web_enhance_cards_enabled": False
+}
@@ -1,38 +1,170 @@
+import asyncio
 import time
 import random
 import logging
 import re
 import os
-# Patch distutils for Python 3.12+ compatibility
-import sys
-if sys.version_info >= (3, 12):
-    import setuptools
-    try:
-        from setuptools import distutils
-    except ImportError:
-        import distutils
-    sys.modules['distutils'] = distutils
-
-import undetected_chromedriver as uc
+import pathlib
+import subprocess
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import lxml.html
+from lxml import etree
 from typing import List, Optional
 
-from .config import HEADLESS, WINDOW_SIZE, PAGE_LOAD_TIMEOUT, SCROLL_PAUSE_TIME
+from .config import HEADLESS, WINDOW_SIZE, PAGE_LOAD_TIMEOUT, ELEMENT_WAIT_TIMEOUT, SCROLL_PAUSE_TIME, SELECTORS, USE_GRAPHQL_API, MAX_BROWSER_WORKERS, BLOCKED_URL_PATTERNS
+from .api_client import TwitterApiClient, ApiUnavailableError
 from .utils import parse_count, extract_hashtags, extract_mentions
 from models.data_models import Profile, Tweet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _href_endswith(suffix: str) -> str:
+    # XPath 1.0 has no ends-with()
+    return f"substring(@href, string-length(@href) - {len(suffix) - 1}) = '{suffix}'"
+
+def _status_id(href: str) -> Optional[int]:
+    """Numeric tweet id from a /{user}/status/{id}[/...] link"""
+    tail = href.rsplit('/status/', 1)[-1].split('?', 1)[0].split('/', 1)[0]
+    return int(tail) if tail.isdigit() else None
+
+def _xpath(expr: str) -> etree.XPath:
+    # Plain str results so nothing returned keeps a reference to the parsed tree
+    return etree.XPath(expr, smart_strings=False)
+
+# Compiled once and evaluated by lxml in C. String-valued expressions
+# return '' when nothing matches.
+XP_PRIMARY_TEXT = _xpath("string(//div[@data-testid='primaryColumn'])")
+XP_HEADER_TEXTS = _xpath("//div[@data-testid='primaryColumn']/div[1]//text()")
+XP_FULL_NAME = _xpath("normalize-space((//div[@data-testid='UserName']//span[normalize-space()])[1])")
+XP_BIO = _xpath("normalize-space(//div[@data-testid='UserDescription'])")
+XP_VERIFIED = _xpath("boolean(//svg[@data-testid='icon-verified'])")
+XP_PROFILE_IMAGES = _xpath("//img[contains(@src, 'profile_images')]/@src")
+XP_BANNER = _xpath("string((//img[contains(@src, 'profile_banners')]/@src)[1])")
+XP_LOCATION = _xpath("normalize-space(//span[@data-testid='UserLocation'])")
+XP_JOIN_DATE = _xpath("normalize-space(//span[@data-testid='UserJoinDate'])")
+XP_FOLLOWING_TEXT = _xpath(f"normalize-space((//a[{_href_endswith('/following')}])[1])")
+XP_FOLLOWERS_TEXT = _xpath(f"normalize-space((//a[{_href_endswith('/followers')}])[1])")
+XP_VERIFIED_FOLLOWERS_TEXT = _xpath(f"normalize-space((//a[{_href_endswith('/verified_followers')}])[1])")
+
+XP_TWEET_TEXT = _xpath("normalize-space(.//div[@data-testid='tweetText'])")
+XP_TIME = _xpath("string(.//time/@datetime)")
+XP_METRIC_BUTTONS = _xpath(".//button[@data-testid='like' or @data-testid='retweet' or @data-testid='reply']")
+XP_ANALYTICS_TEXT = _xpath("normalize-space((.//a[contains(@href, '/analytics')])[1])")
+XP_REPLYING_TO = _xpath("(.//div[contains(text(), 'Replying to')])[1]")
+XP_NEXT_LINK_TEXT = _xpath("normalize-space((descendant::a | following::a)[1])")
+
+XP_TWEETS = _xpath(".//article[@data-testid='tweet']")
+XP_STATUS = _xpath("string((.//a[contains(@href, '/status/')]/@href)[1])")
+
+XP_USERCELL = _xpath(".//div[@data-testid='UserCell']")
+XP_USER_LINK = _xpath("string((.//a/@href)[1])")
+XP_USER_NAME = _xpath("normalize-space((.//div[@dir='auto'])[1])")
+XP_USER_AVATAR = _xpath("string((.//img/@src)[1])")
+
+# Everything we parse lives under this node
+PRIMARY_COLUMN_SELECTOR = "div[data-testid='primaryColumn']"
+
+# Async script: scrolls to the bottom, waits arguments[0] ms for the next
+# batch to load, then returns the page height. The height is read after the
+# wait, so it describes the DOM the next parse will see.
+SCROLL_JS = """
+const done = arguments[arguments.length - 1];
+window.scrollTo(0, document.body.scrollHeight);
+setTimeout(() => done(document.body.scrollHeight), arguments[0]);
+"""
+
+def _import_uc():
+    # Imported lazily rather than at module level: undetected_chromedriver
+    # (and the distutils shim it needs) is slow to import, and plenty of
+    # callers only want the parsing helpers or the API client
+    from ._compat import patch_distutils
+    patch_distutils()
+    import undetected_chromedriver as uc
+    return uc
+
+_driver_binary_lock = threading.Lock()
+_driver_binary_ready = False
+
+_RE_MAJOR_VERSION = re.compile(r'(\d+)\.\d+\.\d+')
+
+def _major_version(executable: str) -> Optional[int]:
+    """Major version from `<executable> --version` (Chrome or chromedriver)"""
+    try:
+        out = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _RE_MAJOR_VERSION.search(out)
+    return int(match.group(1)) if match else None
+
+def prepare_driver_binary():
+    """Download and patch chromedriver once, unless a matching patched copy exists.
+
+    Drivers start with user_multi_procs, so they reuse the newest patched
+    binary in undetected_chromedriver's data folder instead of each one
+    re-patching the same file while other browsers are running it. That
+    binary is replaced when its major version no longer matches the
+    installed Chrome, e.g. after a Chrome upgrade. Call this in the parent
+    before spawning browser worker processes.
+    """
+    global _driver_binary_ready
+    with _driver_binary_lock:
+        if _driver_binary_ready:
+            return
+        uc = _import_uc()
+        chrome = os.environ.get("CHROME_BIN") or uc.find_chrome_executable()
+        chrome_major = _major_version(chrome) if chrome else None
+        # version_main=0 lets the patcher pick the latest driver
+        patcher = uc.Patcher(version_main=chrome_major or 0)
+
+        # The same file uc.Chrome(user_multi_procs=True) will pick
+        drivers = list(pathlib.Path(patcher.data_path).rglob("*chromedriver*"))
+        current = str(max(drivers, key=lambda f: f.stat().st_mtime)) if drivers else None
+        if (
+            current is None
+            or not patcher.is_binary_patched(current)
+            or (chrome_major is not None and _major_version(current) != chrome_major)
+        ):
+            logger.info("Patching chromedriver for Chrome %s", chrome_major or "(latest)")
+            patcher.auto()
+        _driver_binary_ready = True
+
 class TwitterScraper:
-    def __init__(self, headless: bool = HEADLESS):
+    # Patterns are compiled once here rather than on every parse call
+    _RE_POSTS_HDR = re.compile(r'(?:^|\s)([\d,.KMB]+)\s*(?:posts|tweets)', re.IGNORECASE)
+    _RE_POSTS_TITLE = re.compile(r'\(([\d,.KMB]+)\s*(?:posts?|tweets?)\)', re.IGNORECASE)
+    # aria-labels carry full counts with thousands separators ("12,345 Likes")
+    _RE_LIKES = re.compile(r'(\d[\d,]*)\s+likes?', re.IGNORECASE)
+    _RE_RT = re.compile(r'(\d[\d,]*)\s+reposts?', re.IGNORECASE)
+    _RE_REPLIES = re.compile(r'(\d[\d,]*)\s+replies?', re.IGNORECASE)
+    _RE_COUNT_LEAD = re.compile(r'^([\d,.KMB]+)')
+
+    def __init__(self, headless: bool = HEADLESS, use_api: bool = USE_GRAPHQL_API):
         self.headless = headless
-        self.driver = self._setup_driver()
+        # Chrome is started on first browser use: when the API serves every
+        # call, no browser is ever launched
+        self._driver = None
+        self._column_node_id = None
+        # The API client is async; calls from these synchronous methods run on
+        # a loop owned by this scraper so its connection pool is reused
+        self._api = TwitterApiClient() if use_api else None
+        self._api_loop = asyncio.new_event_loop() if self._api else None
+        self._api_enabled = self._api is not None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self._setup_driver()
+        return self._driver
 
     def _setup_driver(self):
+        uc = _import_uc()
+        prepare_driver_binary()
+
         options = uc.ChromeOptions()
         if self.headless:
             options.add_argument('--headless=new')
@@ -41,6 +173,7 @@ class TwitterScraper:
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--blink-settings=imagesEnabled=false')
         
         # Check for custom binary location (Render)
         chrome_bin = os.environ.get("CHROME_BIN")
@@ -51,13 +184,81 @@ class TwitterScraper:
         # But usually uc handles it if binary is provided.
         # We pass headless=True/False to uc.Chrome if needed, but we set options.headless already.
         
-        driver = uc.Chrome(options=options)
+        driver = uc.Chrome(options=options, user_multi_procs=True)
+        driver.execute_cdp_cmd('DOM.enable', {})
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
         return driver
 
     def _wait_random(self, min_delay: float = 2.0, max_delay: float = 5.0):
         time.sleep(random.uniform(min_delay, max_delay))
 
-    def _extract_profile_data(self, soup) -> dict:
+    def _wait_for(self, css: str, timeout: float = ELEMENT_WAIT_TIMEOUT) -> bool:
+        """Wait until an element matching css is in the DOM.
+
+        Returns as soon as the page has rendered what we need instead of
+        sleeping a fixed floor; False if it never showed up.
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+            return True
+        except TimeoutException:
+            logger.warning("Timed out waiting for %s", css)
+            return False
+
+    def _try_api(self, method: str, *args):
+        """Run a TwitterApiClient call, or return None if the browser should be used.
+
+        Once the API refuses us it stays disabled for this scraper's lifetime;
+        any other failure (rate limits, 5xx, timeouts, payloads without the
+        expected data) only sends this one call to the browser.
+        """
+        if not self._api_enabled:
+            return None
+        try:
+            return self._api_loop.run_until_complete(getattr(self._api, method)(*args))
+        except ApiUnavailableError as e:
+            logger.warning("GraphQL API unavailable, falling back to the browser: %s", e)
+            self._api_enabled = False
+            return None
+        except Exception as e:
+            logger.warning("GraphQL API call %s failed, falling back to the browser: %s", method, e)
+            return None
+
+    def _get(self, url: str):
+        self.driver.get(url)
+        # CDP node ids belong to the previous document
+        self._column_node_id = None
+
+    def _resolve_column_node(self) -> Optional[int]:
+        root = self.driver.execute_cdp_cmd('DOM.getDocument', {'depth': 0})
+        node = self.driver.execute_cdp_cmd('DOM.querySelector', {
+            'nodeId': root['root']['nodeId'],
+            'selector': PRIMARY_COLUMN_SELECTOR
+        })
+        # querySelector returns nodeId 0 when nothing matches
+        return node.get('nodeId') or None
+
+    def _primary_column(self):
+        """Parse the primary column, or return None if it isn't rendered yet.
+
+        The HTML comes from CDP DOM.getOuterHTML on the column's node, so Chrome
+        serializes only that subtree instead of the whole page_source.
+        """
+        for _ in range(2):
+            if self._column_node_id is None:
+                self._column_node_id = self._resolve_column_node()
+                if self._column_node_id is None:
+                    return None
+            try:
+                html = self.driver.execute_cdp_cmd('DOM.getOuterHTML', {'nodeId': self._column_node_id})['outerHTML']
+                return lxml.html.fragment_fromstring(html)
+            except WebDriverException:
+                # The node was replaced by a re-render; look it up again
+                self._column_node_id = None
+        return None
+
+    def _extract_profile_data(self, doc, title: str = "") -> dict:
         """Extract profile data from page source"""
         profile_data = {
             'full_name': None,
@@ -75,36 +276,26 @@ class TwitterScraper:
         
         try:
             # Log the header text to see what we're working with
-            header = soup.find('div', {'data-testid': 'primaryColumn'})
-            if header:
-                logger.info(f"Header text found: {header.get_text()[:100]}...")
+            # (only pull it out of the tree when INFO is actually enabled)
+            if logger.isEnabledFor(logging.INFO):
+                header_text = XP_PRIMARY_TEXT(doc)
+                if header_text:
+                    logger.info("Header text found: %.100s...", header_text)
             
             # Full name
-            name_tag = soup.find('div', {'data-testid': 'UserName'})
-            if name_tag:
-                full_name = name_tag.find('span', string=True).get_text(strip=True)
-                profile_data['full_name'] = full_name
+            profile_data['full_name'] = XP_FULL_NAME(doc) or None
             
             # Bio/Description
-            # Try standard testid, then fallback to looking for the element with dir="auto" in the header
-            bio_el = soup.find('div', {'data-testid': 'UserDescription'})
-            if bio_el:
-                profile_data['bio'] = bio_el.get_text(strip=True)
-            else:
-                # Fallback: sometimes bio is just a span under the username
-                # This is risky but might catch cases where testid is missing
-                pass
+            profile_data['bio'] = XP_BIO(doc) or None
             
             # Verification
-            verified_icon = soup.find('svg', {'data-testid': 'icon-verified'})
-            profile_data['is_verified'] = verified_icon is not None
+            profile_data['is_verified'] = XP_VERIFIED(doc)
             
             # Profile Image - Strict selector
             # Look for the image inside the primary column that has 'profile_images' in src
             # and is likely the main avatar (usually larger size or specific class)
-            images = soup.find_all('img', src=re.compile(r'profile_images'))
-            for img in images:
-                src = img.get('src', '')
+            images = XP_PROFILE_IMAGES(doc)
+            for src in images:
                 # Filter out tiny avatars often found in "Followed by" sections
                 if '200x200' in src or '400x400' in src:
                     profile_data['profile_image_url'] = src
@@ -112,98 +303,93 @@ class TwitterScraper:
             
             # Fallback for profile image if no high-res found
             if not profile_data['profile_image_url'] and images:
-                profile_data['profile_image_url'] = images[0]['src']
+                profile_data['profile_image_url'] = images[0]
 
             # Banner
-            banner = soup.find('img', src=re.compile(r'profile_banners'))
-            if banner:
-                profile_data['banner_image_url'] = banner['src']
+            profile_data['banner_image_url'] = XP_BANNER(doc) or None
             
             # Location
-            loc = soup.find('span', {'data-testid': 'UserLocation'})
-            if loc:
-                profile_data['location'] = loc.get_text(strip=True)
+            profile_data['location'] = XP_LOCATION(doc) or None
                 
             # Join Date
-            join = soup.find('span', {'data-testid': 'UserJoinDate'})
-            if join:
-                profile_data['join_date'] = join.get_text(strip=True)
-
-            # Tweet Count - Try multiple strategies
-            # Strategy 1: Look for "X posts" text in the header specifically
-            # The header is usually a sticky bar at the top
-            header_text = ""
-            primary_col = soup.find('div', {'data-testid': 'primaryColumn'})
-            if primary_col:
-                # Get just the top part (header)
-                header_div = primary_col.find('div', recursive=False)
-                if header_div:
-                    header_text = header_div.get_text()
-            
-            # If we couldn't isolate the header, just grab the first 500 chars of the body
-            if not header_text:
-                header_text = soup.get_text()[:500]
-
-            logger.info(f"Scanning for tweet count in: {header_text[:100]}...")
+            profile_data['join_date'] = XP_JOIN_DATE(doc) or None
 
-            # Regex to find "229.5K posts" or "1,242 posts"
-            # Allow for optional space, case insensitive
-            # We look for a number at the start of the string or preceded by whitespace
-            count_match = re.search(r'(?:^|\s)([\d,.KMB]+)\s*(?:posts|tweets)', header_text, re.IGNORECASE)
+            # Tweet Count
+            # The page title reads "Name (@handle) / X", with the post count in
+            # parentheses on some layouts ("(7,423 Posts)"); try that first
+            count_match = self._RE_POSTS_TITLE.search(title)
             if count_match:
                 count_str = count_match.group(1)
-                logger.info(f"Found tweet count match: {count_str}")
+                logger.info("Found tweet count in title: %s", count_str)
                 profile_data['tweets_count'] = parse_count(count_str)
-            
-            # Strategy 2: Look for any element containing "posts" or "tweets" that starts with a number
-            if profile_data['tweets_count'] == 0:
-                candidates = soup.find_all(string=re.compile(r'\d+.*\s(posts|tweets)', re.IGNORECASE))
-                for c in candidates:
-                    # Check if it looks like a header count (short length)
-                    if len(c) < 20:
-                        match = re.search(r'([\d,.KMB]+)', c)
-                        if match:
-                            profile_data['tweets_count'] = parse_count(match.group(1))
-                            logger.info(f"Found tweet count via text search: {match.group(1)}")
-                            break
+            else:
+                # Otherwise look for "X posts" text in the header specifically
+                # The header is usually a sticky bar at the top
+                # Join text nodes with spaces: the name and "229.5K posts" sit
+                # in adjacent elements with nothing between them
+                header_text = " ".join(XP_HEADER_TEXTS(doc))
+                
+                # If we couldn't isolate the header, just grab the first 500 chars of the body
+                if not header_text:
+                    header_text = doc.text_content()[:500]
+
+                logger.info("Scanning for tweet count in: %.100s...", header_text)
+
+                # Regex to find "229.5K posts" or "1,242 posts"
+                # Allow for optional space, case insensitive
+                # We look for a number at the start of the string or preceded by whitespace
+                count_match = self._RE_POSTS_HDR.search(header_text)
+                if count_match:
+                    count_str = count_match.group(1)
+                    logger.info("Found tweet count match: %s", count_str)
+                    profile_data['tweets_count'] = parse_count(count_str)
             
             # Followers/Following
             # Look for links with specific hrefs
-            following_link = soup.find('a', href=re.compile(r'/following$'))
-            if following_link:
-                text = following_link.get_text(strip=True)
-                match = re.search(r'^([\d,.KMB]+)', text)
-                if match:
-                    profile_data['following_count'] = parse_count(match.group(1))
+            match = self._RE_COUNT_LEAD.search(XP_FOLLOWING_TEXT(doc))
+            if match:
+                profile_data['following_count'] = parse_count(match.group(1))
             
-            followers_link = soup.find('a', href=re.compile(r'/verified_followers$')) or soup.find('a', href=re.compile(r'/followers$'))
-            if followers_link:
-                text = followers_link.get_text(strip=True)
-                match = re.search(r'^([\d,.KMB]+)', text)
-                if match:
-                    profile_data['followers_count'] = parse_count(match.group(1))
+            match = self._RE_COUNT_LEAD.search(XP_VERIFIED_FOLLOWERS_TEXT(doc) or XP_FOLLOWERS_TEXT(doc))
+            if match:
+                profile_data['followers_count'] = parse_count(match.group(1))
 
-            logger.info(f"Extracted profile data: {profile_data}")
+            logger.info("Extracted profile data: %s", profile_data)
 
         except Exception as e:
-            logger.error(f"Error extracting profile data: {e}")
+            logger.error("Error extracting profile data: %s", e)
         
         return profile_data
 
     def scrape_profile(self, username: str) -> Optional[Profile]:
+        try:
+            profile = self._try_api('get_profile', username)
+            if profile is not None:
+                return profile
+        except Exception as e:
+            logger.error("Error scraping profile %s: %s", username, e)
+            return None
+        return self._scrape_profile_browser(username)
+
+    def _scrape_profile_browser(self, username: str) -> Optional[Profile]:
         url = f"https://twitter.com/{username}"
-        logger.info(f"Scraping profile: {url}")
+        logger.info("Scraping profile: %s", url)
         
         try:
-            self.driver.get(url)
-            self._wait_random(5, 7)
+            self._get(url)
+            self._wait_for(SELECTORS["profile"]["username"])
             
             # Scroll slightly to ensure elements load
             self.driver.execute_script("window.scrollTo(0, 150)")
-            time.sleep(1)
+            self._wait_random(0.3, 0.8)
             
-            soup = BeautifulSoup(self.driver.page_source, 'lxml')
-            profile_data = self._extract_profile_data(soup)
+            # Profile data all lives in the primary column, so parse just that
+            # subtree rather than the head, scripts and sidebars too
+            doc = self._primary_column()
+            if doc is None:
+                doc = lxml.html.fromstring(self.driver.page_source)
+            # Only the column is parsed, so the <title> comes from the driver
+            profile_data = self._extract_profile_data(doc, self.driver.title)
             
             return Profile(
                 username=username,
@@ -222,28 +408,101 @@ class TwitterScraper:
             )
             
         except Exception as e:
-            logger.error(f"Error scraping profile {username}: {e}")
+            logger.error("Error scraping profile %s: %s", username, e)
             return None
 
-    def _parse_tweet_element(self, tweet_el, username) -> Optional[Tweet]:
+    async def scrape_profiles(self, usernames: List[str]) -> List[Optional[Profile]]:
+        """Scrape several profiles concurrently, returned in input order.
+
+        Profiles are fetched with concurrent API calls while the API is
+        available. Whatever is left is spread over up to MAX_BROWSER_WORKERS
+        browsers: this scraper's plus extra ones opened for the batch.
+        """
+        results: List[Optional[Profile]] = [None] * len(usernames)
+        pending = list(range(len(usernames)))
+        if self._api_enabled and pending:
+            pending = await self._scrape_profiles_api(usernames, pending, results)
+        if pending:
+            await self._scrape_profiles_browser(usernames, pending, results)
+        return results
+
+    async def _scrape_profiles_api(self, usernames: List[str], pending: List[int], results: List[Optional[Profile]]) -> List[int]:
+        """Fill results from the API, returning the indexes the browser should retry"""
+        # self._api belongs to this scraper's private loop, so use a client
+        # bound to the caller's loop for the batch
+        api = TwitterApiClient()
+        try:
+            outcomes = await asyncio.gather(*(api.get_profile(usernames[i]) for i in pending), return_exceptions=True)
+        finally:
+            await api.aclose()
+
+        retry = []
+        for i, outcome in zip(pending, outcomes):
+            if isinstance(outcome, ApiUnavailableError):
+                self._api_enabled = False
+                retry.append(i)
+            elif isinstance(outcome, Exception):
+                logger.warning("GraphQL API call get_profile failed for %s, falling back to the browser: %s", usernames[i], outcome)
+                retry.append(i)
+            elif outcome is None:
+                retry.append(i)
+            else:
+                results[i] = outcome
+        if not self._api_enabled:
+            logger.warning("GraphQL API unavailable, falling back to the browser")
+        return retry
+
+    async def _scrape_profiles_browser(self, usernames: List[str], pending: List[int], results: List[Optional[Profile]]):
+        loop = asyncio.get_running_loop()
+        jobs = asyncio.Queue()
+        for i in pending:
+            jobs.put_nowait(i)
+
+        def open_helper() -> "TwitterScraper":
+            helper = TwitterScraper(headless=self.headless, use_api=False)
+            # Drivers are otherwise started lazily; start this one now so a
+            # browser that fails to launch is dropped from the batch up front
+            helper.driver
+            return helper
+
+        # Each worker owns one browser; drivers are blocking, so every call
+        # runs in the default executor while the others keep going. Patch
+        # chromedriver before the drivers start so they all reuse it.
+        await loop.run_in_executor(None, prepare_driver_binary)
+        extra = min(len(pending), MAX_BROWSER_WORKERS) - 1
+        opened = await asyncio.gather(
+            *(loop.run_in_executor(None, open_helper) for _ in range(extra)),
+            return_exceptions=True
+        )
+        helpers = [s for s in opened if isinstance(s, TwitterScraper)]
+        if len(helpers) < extra:
+            logger.warning("Opened %d of %d extra browsers", len(helpers), extra)
+
+        async def worker(scraper: "TwitterScraper"):
+            while not jobs.empty():
+                i = jobs.get_nowait()
+                results[i] = await loop.run_in_executor(None, scraper._scrape_profile_browser, usernames[i])
+
+        try:
+            await asyncio.gather(*(worker(s) for s in [self, *helpers]))
+        finally:
+            await asyncio.gather(*(loop.run_in_executor(None, s.close) for s in helpers))
+
+    def _parse_tweet_element(self, tweet_el, username, tweet_id: Optional[int] = None) -> Optional[Tweet]:
         """Parse a single tweet element"""
         try:
             # Debug: Log the first 100 chars of the tweet element text to see what's in there
-            # logger.info(f"Raw tweet element text: {tweet_el.get_text()[:50]}...")
+            # logger.info("Raw tweet element text: %.50s...", tweet_el.text_content())
 
             # Tweet Text
             # STRICT: Only look inside data-testid="tweetText"
-            text_el = tweet_el.find('div', {'data-testid': 'tweetText'})
-            text = ""
-            if text_el:
-                text = text_el.get_text(strip=True)
+            text = XP_TWEET_TEXT(tweet_el)
             
             # If text is empty, it might be an image/video only tweet.
             # We explicitly DO NOT want to grab other text (like metrics) as fallback.
             
             # Timestamp
-            time_el = tweet_el.find('time')
-            timestamp = time_el['datetime'] if time_el else None
+            timestamp = XP_TIME(tweet_el) or None
             
             # Metrics
             # Use aria-labels for most accurate counts
@@ -252,60 +511,51 @@ class TwitterScraper:
             replies = 0
             views = 0
             
-            # Helper to extract number from aria-label or text
+            # Helper to extract number from aria-label. X always labels the
+            # action buttons with their counts, so there's no text fallback.
             def extract_metric(element, pattern):
-                if not element:
+                if element is None:
                     return 0
-                
-                # Try aria-label first
-                label = element.get('aria-label', '')
-                if label:
-                    match = re.search(pattern, label, re.IGNORECASE)
-                    if match:
-                        return int(match.group(1))
-                
-                # Fallback: Try text content
-                text = element.get_text(strip=True)
-                if text:
-                    # Look for simple number (e.g. "100", "1.2K")
-                    # Be careful not to grab "Reply" text
-                    match = re.search(r'([\d,.KMB]+)', text)
-                    if match:
-                        return parse_count(match.group(1))
-                return 0
+                label = element.get('aria-label')
+                if not label:
+                    return 0
+                match = pattern.search(label)
+                return int(match.group(1).replace(',', '')) if match else 0
+
+            # Collect the like/retweet/reply buttons in one traversal, keyed
+            # by testid (first match wins, as with a per-button search)
+            buttons = {}
+            for button in XP_METRIC_BUTTONS(tweet_el):
+                buttons.setdefault(button.get('data-testid'), button)
 
             # Likes
-            like_el = tweet_el.find('button', {'data-testid': 'like'})
-            likes = extract_metric(like_el, r'(\d+)\s+likes?')
+            likes = extract_metric(buttons.get('like'), self._RE_LIKES)
             
             # Retweets
-            rt_el = tweet_el.find('button', {'data-testid': 'retweet'})
-            retweets = extract_metric(rt_el, r'(\d+)\s+reposts?')
+            retweets = extract_metric(buttons.get('retweet'), self._RE_RT)
             
             # Replies
-            reply_el = tweet_el.find('button', {'data-testid': 'reply'})
-            replies = extract_metric(reply_el, r'(\d+)\s+replies?')
+            replies = extract_metric(buttons.get('reply'), self._RE_REPLIES)
             
             # Views (often just a link with 'analytics' in href)
-            views_el = tweet_el.find('a', href=re.compile(r'/analytics'))
-            if views_el:
-                # Text usually "23M Views" or just "23M"
-                v_text = views_el.get_text(strip=True)
-                match = re.search(r'([\d,.KMB]+)', v_text)
+            # Text usually "23M Views" or just "23M"
+            # The count always leads, so anchor the match instead of scanning
+            v_text = XP_ANALYTICS_TEXT(tweet_el)
+            if v_text:
+                match = self._RE_COUNT_LEAD.match(v_text)
                 if match:
                     views = parse_count(match.group(1))
 
             # Reply info
             is_reply = False
             reply_to = None
-            reply_div = tweet_el.find('div', string=re.compile(r'Replying to'))
+            reply_div = XP_REPLYING_TO(tweet_el)
             if reply_div:
                 is_reply = True
-                link = reply_div.find_next('a')
-                if link:
-                    reply_to = link.get_text(strip=True)
+                reply_to = XP_NEXT_LINK_TEXT(reply_div[0]) or None
 
             return Tweet(
+                id=str(tweet_id) if tweet_id else None,
                 text=text,
                 username=username,
                 timestamp=timestamp,
@@ -314,76 +564,96 @@ class TwitterScraper:
                 replies=replies,
                 views=views,
                 is_reply=is_reply,
-                reply_to=reply_to
+                reply_to=reply_to,
+                hashtags=extract_hashtags(text),
+                mentions=extract_mentions(text),
+                url=f"https://twitter.com/{username}/status/{tweet_id}" if tweet_id else None
             )
 
         except Exception as e:
-            logger.error(f"Error parsing tweet: {e}")
+            logger.error("Error parsing tweet: %s", e)
             return None
 
     def scrape_tweets(self, username: str, max_tweets: int = 20) -> List[Tweet]:
         url = f"https://twitter.com/{username}"
-        logger.info(f"Scraping tweets for: {username}")
+        logger.info("Scraping tweets for: %s", username)
         tweets = []
-        seen_texts = set()  # Deduplication
+        seen_ids = set()  # Status ids already parsed
         
         try:
-            self.driver.get(url)
-            self._wait_random(3, 5)
+            api_tweets = self._try_api('get_user_tweets', username, max_tweets)
+            if api_tweets is not None:
+                return api_tweets
+
+            self._get(url)
+            self._wait_for(SELECTORS["tweet"]["container"])
+            self._wait_random(0.3, 0.8)
             
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            last_height = None
             scroll_attempts = 0
             max_scroll_attempts = 10
             
             while len(tweets) < max_tweets and scroll_attempts < max_scroll_attempts:
-                soup = BeautifulSoup(self.driver.page_source, 'lxml')
-                tweet_elements = soup.find_all('article', attrs={'data-testid': 'tweet'})
+                # The last scroll's reading was taken after its load wait, so
+                # if the height didn't grow there is nothing new to parse
+                column = self._primary_column() if scroll_attempts == 0 else None
+                tweet_elements = XP_TWEETS(column) if column is not None else []
                 
                 for tweet_el in tweet_elements:
                     if len(tweets) >= max_tweets:
                         break
                     
-                    parsed_tweet = self._parse_tweet_element(tweet_el, username)
-                    if parsed_tweet and parsed_tweet.text not in seen_texts:
+                    # Articles stay in the column across scrolls; dedupe on the
+                    # status id before parsing anything else. Articles without
+                    # a status link aren't tweets we can identify.
+                    tweet_id = _status_id(XP_STATUS(tweet_el))
+                    if tweet_id is None or tweet_id in seen_ids:
+                        continue
+                    seen_ids.add(tweet_id)
+                    
+                    parsed_tweet = self._parse_tweet_element(tweet_el, username, tweet_id)
+                    if parsed_tweet:
                         tweets.append(parsed_tweet)
-                        seen_texts.add(parsed_tweet.text)
-                        logger.info(f"Parsed tweet {len(tweets)}: {parsed_tweet.text[:50]}...")
-                
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                self._wait_random(SCROLL_PAUSE_TIME, SCROLL_PAUSE_TIME + 2)
+                        logger.info("Parsed tweet %d: %.50s...", len(tweets), parsed_tweet.text)
                 
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                # Scroll down and wait for the next batch in one round-trip
+                pause_ms = random.uniform(SCROLL_PAUSE_TIME, SCROLL_PAUSE_TIME + 2) * 1000
+                new_height = self.driver.execute_async_script(SCROLL_JS, pause_ms)
                 if new_height == last_height:
                     scroll_attempts += 1
                 else:
                     scroll_attempts = 0
                 last_height = new_height
             
-            logger.info(f"Successfully scraped {len(tweets)} tweets")
+            logger.info("Successfully scraped %d tweets", len(tweets))
             return tweets
             
         except Exception as e:
-            logger.error(f"Error scraping tweets for {username}: {e}")
+            logger.error("Error scraping tweets for %s: %s", username, e)
             return tweets
 
     def scrape_following(self, username: str, max_count: int = 20) -> List[Profile]:
         url = f"https://twitter.com/{username}/following"
-        logger.info(f"Scraping following for: {username}")
+        logger.info("Scraping following for: %s", username)
         profiles = []
         seen_usernames = set()
         
         try:
-            self.driver.get(url)
-            self._wait_random(3, 5)
+            api_profiles = self._try_api('get_following', username, max_count)
+            if api_profiles is not None:
+                return api_profiles
+
+            self._get(url)
+            self._wait_for(SELECTORS["following"]["cell"])
+            self._wait_random(0.3, 0.8)
             
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            last_height = None
             scroll_attempts = 0
             max_scroll_attempts = 10
             
             while len(profiles) < max_count and scroll_attempts < max_scroll_attempts:
-                soup = BeautifulSoup(self.driver.page_source, 'lxml')
-                user_cells = soup.find_all('div', {'data-testid': 'UserCell'})
+                column = self._primary_column() if scroll_attempts == 0 else None
+                user_cells = XP_USERCELL(column) if column is not None else []
                 
                 for cell in user_cells:
                     if len(profiles) >= max_count:
@@ -391,17 +661,16 @@ class TwitterScraper:
                     
                     try:
                         # Extract username
-                        user_link = cell.find('a', href=True)
-                        if not user_link:
+                        href = XP_USER_LINK(cell)
+                        if not href:
                             continue
                             
-                        handle = user_link['href'].strip('/')
+                        handle = href.strip('/')
                         if handle in seen_usernames:
                             continue
                             
                         # Extract Name
-                        name_div = cell.find('div', dir='auto')
-                        name = name_div.get_text(strip=True) if name_div else handle
+                        name = XP_USER_NAME(cell) or handle
                         
                         # Extract Bio
                         bio = ""
@@ -409,8 +678,7 @@ class TwitterScraper:
                         # We'll skip bio for now or try a generic approach
                         
                         # Extract Image
-                        img = cell.find('img', src=True)
-                        avatar = img['src'] if img else None
+                        avatar = XP_USER_AVATAR(cell) or None
                         
                         # Create Profile object (simplified)
                         profile = Profile(
@@ -427,26 +695,38 @@ class TwitterScraper:
                         seen_usernames.add(handle)
                         
                     except Exception as e:
-                        logger.warning(f"Error parsing user cell: {e}")
+                        logger.warning("Error parsing user cell: %s", e)
                         continue
                 
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                self._wait_random(SCROLL_PAUSE_TIME, SCROLL_PAUSE_TIME + 2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
+                # Scroll down and wait for the next batch in one round-trip
+                pause_ms = random.uniform(SCROLL_PAUSE_TIME, SCROLL_PAUSE_TIME + 2) * 1000
+                new_height = self.driver.execute_async_script(SCROLL_JS, pause_ms)
                 if new_height == last_height:
                     scroll_attempts += 1
                 else:
                     scroll_attempts = 0
                 last_height = new_height
                 
-            logger.info(f"Successfully scraped {len(profiles)} following")
+            logger.info("Successfully scraped %d following", len(profiles))
             return profiles
             
         except Exception as e:
-            logger.error(f"Error scraping following for {username}: {e}")
+            logger.error("Error scraping following for %s: %s", username, e)
             return profiles
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def close(self):
-        self.driver.quit()
+        # Safe to call more than once, e.g. an explicit close() inside a with block
+        if self._api_loop is not None and not self._api_loop.is_closed():
+            self._api_loop.run_until_complete(self._api.aclose())
+            self._api_loop.close()
+        self._api = None
+        self._api_enabled = False
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
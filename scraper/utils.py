@@ -1,33 +1,33 @@
 import re
 from datetime import datetime
 
+_HASHTAG_RE = re.compile(r"#(\w+)")
+_MENTION_RE = re.compile(r"@(\w+)")
+
+# Keyed by the last character so the suffix needs no upper()/regex
+_SUFFIX_MULTIPLIERS = {
+    'K': 1000, 'M': 1000000, 'B': 1000000000,
+    'k': 1000, 'm': 1000000, 'b': 1000000000
+}
+
 def parse_count(count_str: str) -> int:
     """Converts string counts like '1.2K' to integers."""
     if not count_str:
         return 0
     
-    count_str = count_str.strip().upper()
-    multiplier = 1
-    
-    if count_str.endswith('K'):
-        multiplier = 1000
-        count_str = count_str[:-1]
-    elif count_str.endswith('M'):
-        multiplier = 1000000
-        count_str = count_str[:-1]
-    elif count_str.endswith('B'):
-        multiplier = 1000000000
-        count_str = count_str[:-1]
-        
+    multiplier = _SUFFIX_MULTIPLIERS.get(count_str[-1], 1)
+    number = count_str[:-1] if multiplier != 1 else count_str
+    if ',' in number:
+        number = number.replace(',', '')
     try:
-        return int(float(count_str.replace(',', '')) * multiplier)
-    except ValueError:
+        return int(float(number) * multiplier)
+    except (ValueError, OverflowError):
         return 0
 
 def extract_hashtags(text: str) -> list:
     """Extracts hashtags from text."""
-    return re.findall(r"#(\w+)", text)
+    return _HASHTAG_RE.findall(text)
 
 def extract_mentions(text: str) -> list:
     """Extracts mentions from text."""
-    return re.findall(r"@(\w+)", text)
+    return _MENTION_RE.findall(text)
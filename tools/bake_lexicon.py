@@ -0,0 +1,34 @@
+"""Bake VADER's lexicon files into analytics/lexicon_data.py.
+
+VADER reads and parses vader_lexicon.txt and emoji_utf8_lexicon.txt every
+time a SentimentIntensityAnalyzer is created. Writing them out as Python
+dict literals lets the interpreter load them straight from the cached .pyc.
+
+Re-run after upgrading vaderSentiment:
+
+    python tools/bake_lexicon.py
+"""
+import os
+from importlib.metadata import version
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "analytics", "lexicon_data.py")
+
+def _write_dict(f, name, mapping):
+    f.write(f"{name} = {{\n")
+    for key, value in mapping.items():
+        f.write(f"    {key!r}: {value!r},\n")
+    f.write("}\n")
+
+def main():
+    # Let VADER parse its own files so the baked data matches it exactly
+    sia = SentimentIntensityAnalyzer()
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        f.write(f"# Generated by tools/bake_lexicon.py from vaderSentiment {version('vaderSentiment')}. Do not edit.\n\n")
+        _write_dict(f, "LEXICON", sia.lexicon)
+        f.write("\n")
+        _write_dict(f, "EMOJI_LEXICON", sia.emojis)
+    print(f"Wrote {len(sia.lexicon)} words and {len(sia.emojis)} emojis to {OUTPUT}")
+
+if __name__ == "__main__":
+    main()